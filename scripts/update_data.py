@@ -17,15 +17,26 @@ Usage:
 
     # Specify date range
     python scripts/update_data.py --start-date 2025-01-10 --end-date 2025-01-15
+
+    # Re-download every frame instead of reusing the existing output
+    python scripts/update_data.py --full
+
+    # Bypass the local S3 object cache (~/.cache/taiwan-weather)
+    python scripts/update_data.py --no-cache
 """
 
 import json
 import argparse
+import gzip
 import os
+import re
 import sys
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 # Try to load dotenv
 try:
@@ -37,17 +48,112 @@ except ImportError:
 # Try to load boto3
 try:
     import boto3
+    from botocore.config import Config
     from botocore.exceptions import ClientError
     HAS_BOTO3 = True
 except ImportError:
     HAS_BOTO3 = False
 
+# Try to load orjson (faster JSON parse/serialize, works on bytes directly)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _loads(content: bytes) -> Any:
+    """Parse JSON from UTF-8 bytes"""
+    if HAS_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize object to UTF-8 JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def split_data_array(content: bytes) -> Tuple[Dict, Optional[bytes]]:
+    """
+    Parse a temperature JSON file without materializing its grid.
+
+    The top-level `data` array (numbers and nulls only) is cut out of the raw
+    bytes and returned as-is, so it can be written to the output verbatim.
+    Only the remaining small document is parsed.
+
+    Returns:
+        Tuple of (parsed document without `data`, raw `data` bytes).
+        Falls back to a full parse with raw bytes of None if the array
+        cannot be located safely.
+    """
+    key_pos = content.rfind(b'"data"')
+    start = content.find(b'[', key_pos) if key_pos != -1 else -1
+
+    # The key must belong to the top-level object, not a nested one
+    structure = _JSON_STRING_RE.sub(b'', content[:key_pos]) if start != -1 else b''
+    depth = (structure.count(b'{') + structure.count(b'[')
+             - structure.count(b'}') - structure.count(b']'))
+
+    if start != -1 and depth == 1 and content[key_pos + 6:start].strip() == b':':
+        # A grid is only brackets, numbers, nulls, commas and whitespace; the
+        # next key or closing brace ends the run, and the array ends at the
+        # last bracket inside it
+        run = _GRID_CHARS_RE.match(content, start)
+        end = content.rfind(b']', start, run.end()) + 1
+        raw = content[start:end]
+
+        if end and raw.count(b'[') == raw.count(b']'):
+            head = content[:key_pos].rstrip()
+            tail = content[end:].lstrip()
+            if head.endswith(b','):
+                head = head[:-1]
+            elif tail.startswith(b','):
+                tail = tail[1:]
+            try:
+                doc = _loads(head + tail)
+            except ValueError:
+                doc = None
+            if isinstance(doc, dict) and 'data' not in doc:
+                return doc, raw
+
+    return _loads(content), None
+
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
 PUBLIC_DIR = PROJECT_ROOT / 'public'
 OUTPUT_FILE = PUBLIC_DIR / 'temperature_timelapse_data.json'
 
+# YYYY-MM-DD date strings
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Per-timestamp temperature file keys (latest.json and other files never match)
+_FILE_RE = re.compile(r'temperature/\d{4}/\d{2}/\d{2}/temperature_(\d{2})(\d{2})\.json(?:\.gz)?$')
+
+# KEY=VALUE lines of a .env file (comment lines never match)
+_ENV_RE = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=(.*)$', re.MULTILINE)
+
+# Characters that can appear inside a numeric grid array
+_GRID_CHARS_RE = re.compile(rb'[\[\]0-9.eE+\-nul,\s]*')
+
+# JSON string literals (their brackets are not structure)
+_JSON_STRING_RE = re.compile(rb'"(?:[^"\\]|\\.)*"')
+
+# S3 download concurrency (one shared client, pool sized above worker count)
+DOWNLOAD_WORKERS = 32
+LIST_WORKERS = 16
+S3_MAX_POOL_CONNECTIONS = 64
+
+# Local cache of downloaded S3 objects (objects are immutable once uploaded)
+CACHE_DIR = Path.home() / '.cache' / 'taiwan-weather'
+CACHE_MAX_AGE_DAYS = 45
+
+# Write buffer for the timelapse output (tens of MB, written in many small pieces)
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
 
 def load_env_file(env_path: Path) -> Dict[str, str]:
     """Load environment variables from .env file"""
@@ -56,12 +162,10 @@ def load_env_file(env_path: Path) -> Dict[str, str]:
     else:
         # Manual .env parsing
         if env_path.exists():
-            with open(env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        os.environ[key.strip()] = value.strip().strip('"\'')
+            os.environ.update({
+                key: value.strip().strip('"\'')
+                for key, value in _ENV_RE.findall(env_path.read_text())
+            })
 
     return {
         'S3_BUCKET': os.getenv('S3_BUCKET'),
@@ -75,7 +179,12 @@ def load_env_file(env_path: Path) -> Dict[str, str]:
 class S3TemperatureReader:
     """S3 Temperature Data Reader"""
 
-    def __init__(self, config: Dict[str, str]):
+    def __init__(
+        self,
+        config: Dict[str, str],
+        max_pool_connections: int = S3_MAX_POOL_CONNECTIONS,
+        cache_dir: Optional[Path] = None
+    ):
         if not HAS_BOTO3:
             raise ImportError("boto3 is required. Install with: pip install boto3")
 
@@ -93,28 +202,47 @@ class S3TemperatureReader:
         if config.get('S3_ENDPOINT'):
             client_kwargs['endpoint_url'] = config['S3_ENDPOINT']
 
-        self.s3 = boto3.client('s3', **client_kwargs)
+        # One session and client shared by every worker thread; keep-alive
+        # lets pooled connections be reused instead of re-handshaking
+        session = boto3.session.Session()
+        self.s3 = session.client(
+            's3',
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                retries={'mode': 'adaptive', 'max_attempts': 5}
+            ),
+            **client_kwargs
+        )
         self.bucket = config['S3_BUCKET']
 
+        # Optional local cache of object contents, keyed by ETag
+        self.cache_dir = cache_dir
+        if cache_dir:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                print(f"Warning: Could not create cache {cache_dir}, not caching: {e}")
+                self.cache_dir = None
+
     def list_dates(self) -> List[str]:
         """List all dates with temperature data"""
         dates = set()
         prefix = "temperature/"
         paginator = self.s3.get_paginator('list_objects_v2')
 
+        # One flat listing instead of walking year/month/day prefixes,
+        # which costs a round-trip per year and per month
         try:
-            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, Delimiter='/'):
-                for cp in page.get('CommonPrefixes', []):
-                    year_prefix = cp['Prefix']
-                    for month_page in paginator.paginate(Bucket=self.bucket, Prefix=year_prefix, Delimiter='/'):
-                        for month_cp in month_page.get('CommonPrefixes', []):
-                            month_prefix = month_cp['Prefix']
-                            for day_page in paginator.paginate(Bucket=self.bucket, Prefix=month_prefix, Delimiter='/'):
-                                for day_cp in day_page.get('CommonPrefixes', []):
-                                    parts = day_cp['Prefix'].rstrip('/').split('/')
-                                    if len(parts) >= 4:
-                                        date_str = f"{parts[1]}-{parts[2]}-{parts[3]}"
-                                        dates.add(date_str)
+            for page in paginator.paginate(
+                Bucket=self.bucket,
+                Prefix=prefix,
+                PaginationConfig={'PageSize': 1000}
+            ):
+                for obj in page.get('Contents', []):
+                    parts = obj['Key'].split('/')
+                    if len(parts) >= 5:
+                        dates.add(f"{parts[1]}-{parts[2]}-{parts[3]}")
         except ClientError as e:
             print(f"Error listing S3 data: {e}")
             return []
@@ -122,60 +250,150 @@ class S3TemperatureReader:
         return sorted(dates)
 
     def list_files_by_date(self, date: str) -> List[Dict[str, Any]]:
-        """List all temperature files for a specific date"""
-        try:
-            parsed_date = datetime.strptime(date, '%Y-%m-%d')
-            prefix = f"temperature/{parsed_date.strftime('%Y/%m/%d')}/"
-        except ValueError:
+        """
+        List all temperature files for a specific date.
+
+        S3 lists keys in lexicographic order and filenames are
+        temperature_HHMM.json (or .json.gz), so the result is already
+        sorted by time. When both forms exist for one time, the .json.gz
+        key (listed right after the .json key) is kept.
+        """
+        if not _DATE_RE.match(date):
             return []
+        prefix = f"temperature/{date.replace('-', '/')}/"
 
         files = []
         paginator = self.s3.get_paginator('list_objects_v2')
+        time_prefix = f"{date}T"
 
         try:
             for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
                 for obj in page.get('Contents', []):
                     key = obj['Key']
-                    if key.endswith('.json') and 'latest' not in key:
-                        filename = key.split('/')[-1]
-                        if filename.startswith('temperature_'):
-                            time_str = filename.replace('temperature_', '').replace('.json', '')
-                            if len(time_str) == 4:
-                                hour = time_str[:2]
-                                minute = time_str[2:]
-                                files.append({
-                                    'key': key,
-                                    'time': f"{date}T{hour}:{minute}:00+08:00",
-                                    'size': obj['Size']
-                                })
+                    match = _FILE_RE.match(key)
+                    if match:
+                        hour, minute = match.groups()
+                        file_info = {
+                            'key': key,
+                            'time': time_prefix + hour + ':' + minute + ':00+08:00',
+                            'size': obj['Size']
+                        }
+                        if files and files[-1]['time'] == file_info['time']:
+                            files[-1] = file_info
+                        else:
+                            files.append(file_info)
         except ClientError as e:
             print(f"Error listing files for {date}: {e}")
 
-        return sorted(files, key=lambda x: x['time'])
-
-    def get_json(self, s3_key: str) -> Optional[Dict]:
-        """Read JSON file from S3"""
+        return files
+
+    def get_bytes(self, s3_key: str) -> Optional[bytes]:
+        """
+        Read raw file content from S3.
+
+        Gzip-compressed objects (stored with ContentEncoding=gzip or a
+        .json.gz key) are decompressed transparently. With a cache_dir,
+        a HEAD request resolves the ETag and cached content is returned
+        without downloading the object again. A missing or unreadable cache
+        entry falls back to the download.
+        """
+        # Plain GET rather than S3 Select: Select is closed to new AWS accounts
+        # and missing on most S3-compatible endpoints, and the grid bytes are
+        # already passed through unparsed (see split_data_array)
         try:
+            cache_path = None
+            if self.cache_dir:
+                head = self.s3.head_object(Bucket=self.bucket, Key=s3_key)
+                cache_path = self.cache_dir / head['ETag'].strip('"')
+                content = self._read_cache(cache_path)
+                if content is not None:
+                    return content
+
             response = self.s3.get_object(Bucket=self.bucket, Key=s3_key)
-            content = response['Body'].read().decode('utf-8')
-            return json.loads(content)
+            content = response['Body'].read()
+            if response.get('ContentEncoding') == 'gzip' or s3_key.endswith('.gz'):
+                content = gzip.decompress(content)
+
+            if cache_path:
+                self._write_cache(cache_path, content)
+            return content
         except ClientError as e:
-            if e.response['Error']['Code'] == 'NoSuchKey':
+            # HEAD reports a missing key as 404 rather than NoSuchKey
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
                 return None
             print(f"Error reading {s3_key}: {e}")
             return None
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error for {s3_key}: {e}")
+        except (OSError, EOFError, zlib.error) as e:
+            print(f"Decompression error for {s3_key}: {e}")
+            return None
+
+    @staticmethod
+    def _read_cache(cache_path: Path) -> Optional[bytes]:
+        """Read cached object content, or None if it is missing or unreadable"""
+        try:
+            content = cache_path.read_bytes()
+            os.utime(cache_path)
+            return content
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Warning: Could not read cache {cache_path.name}: {e}")
             return None
 
+    @staticmethod
+    def _write_cache(cache_path: Path, content: bytes) -> None:
+        """Atomically write object content to the cache"""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write cache {cache_path.name}: {e}")
+
+
+def prune_cache(cache_dir: Path, max_age_days: int) -> None:
+    """Remove cached objects not used within max_age_days"""
+    if not cache_dir.exists():
+        return
+
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).timestamp()
+    for path in cache_dir.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def load_existing_frames(path: Path) -> Tuple[Dict[str, Dict], Optional[Dict]]:
+    """Load frames from a previous timelapse output, keyed by time"""
+    if not path.exists():
+        return {}, None
+
+    try:
+        old = _loads(path.read_bytes())
+        existing = {frame['time']: frame for frame in old['frames']}
+        return existing, old['metadata'].get('geo_info')
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Warning: Could not read existing output: {e}")
+        return {}, None
+
 
 def download_temperature_data(
     reader: S3TemperatureReader,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    max_frames: int = 720
+    max_frames: int = 720,
+    existing_path: Optional[Path] = None,
+    workers: int = DOWNLOAD_WORKERS
 ) -> List[Dict]:
-    """Download temperature data from S3"""
+    """
+    Download temperature data from S3.
+
+    Frames already present in `existing_path` (a previous output file) are
+    reused instead of downloaded again.
+    """
     print("Listing available dates...")
     all_dates = reader.list_dates()
 
@@ -199,9 +417,9 @@ def download_temperature_data(
 
     # Collect all files
     all_files = []
-    for date in all_dates:
-        files = reader.list_files_by_date(date)
-        all_files.extend(files)
+    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as executor:
+        for files in executor.map(reader.list_files_by_date, all_dates):
+            all_files.extend(files)
 
     print(f"  Total {len(all_files)} temperature files")
 
@@ -210,41 +428,96 @@ def download_temperature_data(
         print(f"  Limiting to latest {max_frames} frames")
         all_files = all_files[-max_frames:]
 
+    # Reuse frames from the previous output
+    existing = {}
+    existing_geo = None
+    if existing_path:
+        existing, existing_geo = load_existing_frames(existing_path)
+
+    pending = [fi for fi in all_files if fi['time'] not in existing]
+    if existing:
+        print(f"  Reusing {len(all_files) - len(pending)} frames from {existing_path.name}")
+
     # Download data
-    frames = []
-    total = len(all_files)
-
-    print(f"Downloading temperature data ({total} files)...")
-
-    for i, file_info in enumerate(all_files):
-        if (i + 1) % 10 == 0 or i == 0:
-            print(f"  Progress: {i + 1}/{total} ({(i + 1) / total * 100:.1f}%)")
-
-        data = reader.get_json(file_info['key'])
-        if data:
-            frame = {
-                'time': file_info['time'],
-                'stats': {
-                    'min': data.get('min_temp'),
-                    'max': data.get('max_temp'),
-                    'avg': data.get('avg_temp'),
-                    'valid_points': data.get('valid_points', 0)
-                },
-                'data': data.get('data', [])
-            }
+    # Worker threads only fetch bytes; each file is parsed here as soon as
+    # its download completes, overlapping with the GETs still in flight
+    total = len(pending)
+    downloaded = {}
+    geo_info = None
 
-            # Save geo_info from first frame
-            if not frames and data.get('geo_info'):
-                frame['geo_info'] = data['geo_info']
+    if pending:
+        print(f"Downloading temperature data ({total} files)...")
 
+        # boto3 clients are thread-safe, so all workers share reader.s3
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(reader.get_bytes, file_info['key']): file_info
+                for file_info in pending
+            }
+            for completed, future in enumerate(as_completed(futures), 1):
+                if completed % 10 == 0 or completed == 1:
+                    print(f"  Progress: {completed}/{total} ({completed / total * 100:.1f}%)")
+
+                file_info = futures[future]
+                content = future.result()
+                if content is None:
+                    continue
+                try:
+                    data, data_raw = split_data_array(content)
+                except json.JSONDecodeError as e:
+                    print(f"JSON parse error for {file_info['key']}: {e}")
+                    continue
+                if not data:
+                    continue
+
+                # geo_info is identical in every file; keep a single copy
+                file_geo = data.pop('geo_info', None)
+                if geo_info is None:
+                    geo_info = file_geo
+
+                frame = {
+                    'time': file_info['time'],
+                    'stats': {
+                        'min': data.get('min_temp'),
+                        'max': data.get('max_temp'),
+                        'avg': data.get('avg_temp'),
+                        'valid_points': data.get('valid_points', 0)
+                    }
+                }
+
+                # Keep the grid as raw JSON bytes when possible
+                if data_raw is not None:
+                    frame['data_raw'] = data_raw
+                else:
+                    frame['data'] = data.get('data', [])
+
+                downloaded[file_info['time']] = frame
+
+    # Merge in file order (all_files is already sorted by time), once per time
+    frames = []
+    for time_str in dict.fromkeys(file_info['time'] for file_info in all_files):
+        frame = downloaded.get(time_str) or existing.get(time_str)
+        if frame:
             frames.append(frame)
 
-    print(f"Downloaded {len(frames)} valid frames")
+    # Save geo_info on first frame
+    geo_info = geo_info or existing_geo
+    if frames and geo_info:
+        frames[0]['geo_info'] = geo_info
+
+    print(f"Downloaded {len(downloaded)} new frames")
+    print(f"Total {len(frames)} valid frames")
     return frames
 
 
 def generate_timelapse_json(frames: List[Dict], output_path: Path) -> Dict:
-    """Generate timelapse JSON file"""
+    """
+    Generate timelapse JSON file.
+
+    Frames are streamed to disk and removed from `frames` as they are
+    written, so only one frame is held by the writer at a time. Returns
+    the metadata of the written file.
+    """
     if not frames:
         return {}
 
@@ -265,39 +538,60 @@ def generate_timelapse_json(frames: List[Dict], output_path: Path) -> Dict:
             'resolution_km': 3.3
         }
 
-    timelapse_data = {
-        'metadata': {
-            'generated_at': datetime.now().isoformat(),
-            'start_time': frames[0]['time'],
-            'end_time': frames[-1]['time'],
-            'total_frames': len(frames),
-            'geo_info': geo_info,
-            'source': 'Central Weather Administration O-A0038-003',
-            'description': 'Taiwan Temperature Grid Timelapse'
-        },
-        'frames': []
+    metadata = {
+        'generated_at': datetime.now().isoformat(),
+        'start_time': frames[0]['time'],
+        'end_time': frames[-1]['time'],
+        'total_frames': len(frames),
+        'geo_info': geo_info,
+        'source': 'Central Weather Administration O-A0038-003',
+        'description': 'Taiwan Temperature Grid Timelapse'
     }
 
-    # Process frames (remove geo_info from individual frames)
-    for frame in frames:
-        frame_data = {
-            'time': frame['time'],
-            'stats': frame['stats'],
-            'data': frame['data']
-        }
-        timelapse_data['frames'].append(frame_data)
-
     # Save JSON
+    # The envelope is written by hand so raw grid bytes can be copied through
+    # (geo_info is only kept in metadata, not in individual frames)
     print(f"Saving timelapse data...")
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(timelapse_data, f, ensure_ascii=False)
+    with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(b'{"metadata":')
+        f.write(_dumps(metadata))
+        f.write(b',"frames":[')
+        frames.reverse()
+        first = True
+        while frames:
+            # Pop so each written frame can be freed immediately
+            frame = frames.pop()
+            if not first:
+                f.write(b',')
+            first = False
+
+            # Serialize the frame dict itself instead of rebuilding it;
+            # raw grid bytes are spliced in before the closing brace
+            frame.pop('geo_info', None)
+            data_raw = frame.pop('data_raw', None)
+            if data_raw is None:
+                f.write(_dumps(frame))
+            else:
+                f.write(_dumps(frame)[:-1])
+                f.write(b',"data":')
+                f.write(data_raw)
+                f.write(b'}')
+        f.write(b']}')
 
     file_size_mb = output_path.stat().st_size / 1024 / 1024
     print(f"  Saved: {output_path.name} ({file_size_mb:.2f} MB)")
 
-    return timelapse_data
+    return {'metadata': metadata}
+
+
+def positive_int(value: str) -> int:
+    """argparse type for integers of at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
 
 
 def main():
@@ -334,6 +628,22 @@ def main():
         default=OUTPUT_FILE,
         help=f'Output file path (default: {OUTPUT_FILE})'
     )
+    parser.add_argument(
+        '--workers',
+        type=positive_int,
+        default=DOWNLOAD_WORKERS,
+        help=f'Number of concurrent S3 downloads (default: {DOWNLOAD_WORKERS})'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Re-download all frames instead of reusing the existing output'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Do not use the local S3 object cache ({CACHE_DIR})'
+    )
     args = parser.parse_args()
 
     print("=" * 60)
@@ -396,7 +706,11 @@ def main():
 
     # Initialize S3 reader
     try:
-        reader = S3TemperatureReader(s3_config)
+        reader = S3TemperatureReader(
+            s3_config,
+            max_pool_connections=max(S3_MAX_POOL_CONNECTIONS, args.workers),
+            cache_dir=None if args.no_cache else CACHE_DIR
+        )
     except Exception as e:
         print(f"ERROR: Cannot connect to S3: {e}")
         sys.exit(1)
@@ -406,9 +720,14 @@ def main():
         reader,
         start_date=start_date,
         end_date=end_date,
-        max_frames=args.max_frames
+        max_frames=args.max_frames,
+        existing_path=None if args.full else args.output,
+        workers=args.workers
     )
 
+    if not args.no_cache:
+        prune_cache(CACHE_DIR, CACHE_MAX_AGE_DAYS)
+
     if not frames:
         print("ERROR: No temperature data available")
         sys.exit(1)
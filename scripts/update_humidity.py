@@ -2,8 +2,8 @@
 """
 Taiwan Humidity Timelapse - Data Update Script
 
-Downloads weather station data from S3, interpolates humidity using scipy griddata,
-and generates the timelapse JSON file.
+Downloads weather station data from S3, interpolates humidity using inverse distance
+weighting, and generates the timelapse JSON file.
 
 Usage:
     # Using .env file in project root
@@ -14,15 +14,28 @@ Usage:
 
     # Specify date range
     python scripts/update_humidity.py --start-date 2025-01-10 --end-date 2025-01-15
+
+    # Re-process every frame instead of reusing the existing output
+    python scripts/update_humidity.py --full
+
+    # Write a compact float16 NumPy archive instead of JSON
+    python scripts/update_humidity.py --format npz
+
+    # Bypass the local S3 object cache (~/.cache/taiwan-weather)
+    python scripts/update_humidity.py --no-cache
 """
 
 import json
 import argparse
 import os
+import re
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 
 # Try to load dotenv
 try:
@@ -34,19 +47,34 @@ except ImportError:
 # Try to load boto3
 try:
     import boto3
+    from botocore.config import Config
     from botocore.exceptions import ClientError
     HAS_BOTO3 = True
 except ImportError:
     HAS_BOTO3 = False
 
+# Try to load orjson (faster JSON parse/serialize, works on bytes directly)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Try to load scipy and numpy
 try:
     import numpy as np
-    from scipy.interpolate import griddata
+    from scipy.spatial import cKDTree
     HAS_SCIPY = True
 except ImportError:
     HAS_SCIPY = False
 
+# Try to load numba (optional JIT for the interpolation kernel)
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -54,6 +82,18 @@ PUBLIC_DIR = PROJECT_ROOT / 'public'
 OUTPUT_FILE = PUBLIC_DIR / 'humidity_timelapse_data.json'
 TEMPERATURE_FILE = PUBLIC_DIR / 'temperature_timelapse_data.json'
 
+# Per-timestamp weather file keys (latest.json and other files never match)
+_FILE_KEY_RE = re.compile(r'weather/(\d{4})/(\d{2})/(\d{2})/weather_(\d{2})(\d{2})\.json$')
+
+# S3 download concurrency (one shared client, pool sized above worker count)
+DOWNLOAD_WORKERS = 32
+S3_MAX_POOL_CONNECTIONS = 64
+
+# Local cache of downloaded S3 objects (objects are immutable once uploaded),
+# shared with update_data.py
+CACHE_DIR = Path.home() / '.cache' / 'taiwan-weather'
+CACHE_MAX_AGE_DAYS = 45
+
 # Grid configuration (matching temperature grid)
 GEO_INFO = {
     'bottom_left_lon': 120.0,
@@ -66,6 +106,52 @@ GEO_INFO = {
     'grid_cols': 67
 }
 
+# Inverse distance weighting: nearest stations used per grid point, and power
+IDW_NEIGHBORS = 4
+IDW_POWER = 2
+INTERPOLATION_METHOD = f'inverse distance weighting (k={IDW_NEIGHBORS}, p={IDW_POWER})'
+
+# Grid values are stored as integers in tenths of a percent; multiply by
+# VALUE_SCALE to get relative humidity
+VALUE_SCALE = 0.1
+
+
+def _loads(content: bytes) -> Any:
+    """Parse JSON from UTF-8 bytes"""
+    if HAS_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize object to UTF-8 JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_target_grid(geo_info: Dict) -> 'np.ndarray':
+    """
+    Build the target grid points as an (rows * cols, 2) array of (lon, lat),
+    in row-major order.
+    """
+    lon = np.linspace(
+        geo_info['bottom_left_lon'],
+        geo_info['top_right_lon'],
+        geo_info['grid_cols']
+    )
+    lat = np.linspace(
+        geo_info['bottom_left_lat'],
+        geo_info['top_right_lat'],
+        geo_info['grid_rows']
+    )
+    grid_lon, grid_lat = np.meshgrid(lon, lat)
+    return np.column_stack([grid_lon.ravel(), grid_lat.ravel()])
+
+
+# Target grid points (depend only on GEO_INFO, built once)
+GRID_POINTS = build_target_grid(GEO_INFO) if HAS_SCIPY else None
+
 
 def load_env_file(env_path: Path) -> Dict[str, str]:
     """Load environment variables from .env file"""
@@ -92,7 +178,12 @@ def load_env_file(env_path: Path) -> Dict[str, str]:
 class S3WeatherReader:
     """S3 Weather Station Data Reader"""
 
-    def __init__(self, config: Dict[str, str]):
+    def __init__(
+        self,
+        config: Dict[str, str],
+        max_pool_connections: int = S3_MAX_POOL_CONNECTIONS,
+        cache_dir: Optional[Path] = None
+    ):
         if not HAS_BOTO3:
             raise ImportError("boto3 is required. Install with: pip install boto3")
 
@@ -110,74 +201,93 @@ class S3WeatherReader:
         if config.get('S3_ENDPOINT'):
             client_kwargs['endpoint_url'] = config['S3_ENDPOINT']
 
-        self.s3 = boto3.client('s3', **client_kwargs)
+        # Keep-alive lets pooled connections be reused across all downloads
+        # instead of re-handshaking
+        self.s3 = boto3.client(
+            's3',
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                retries={'mode': 'adaptive', 'max_attempts': 3}
+            ),
+            **client_kwargs
+        )
         self.bucket = config['S3_BUCKET']
 
-    def list_dates(self) -> List[str]:
-        """List all dates with weather data"""
-        dates = set()
-        prefix = "weather/"
-        paginator = self.s3.get_paginator('list_objects_v2')
+        # Optional local cache of object contents, keyed by ETag
+        self.cache_dir = cache_dir
+        if cache_dir:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                print(f"Warning: Could not create cache {cache_dir}, not caching: {e}")
+                self.cache_dir = None
+
+    def list_all_weather_objects(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Iterator[Tuple[str, str, int]]:
+        """
+        List weather files between two dates (inclusive) with one listing.
+
+        Keys are listed in lexicographic order, which is chronological, so the
+        listing starts after start_date and stops at the first key past
+        end_date.
+
+        Yields:
+            Tuples of (time, key, size), in time order
+        """
+        paginate_kwargs = {'Bucket': self.bucket, 'Prefix': 'weather/'}
+        if start_date:
+            paginate_kwargs['StartAfter'] = f"weather/{start_date.replace('-', '/')}"
 
-        try:
-            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, Delimiter='/'):
-                for cp in page.get('CommonPrefixes', []):
-                    year_prefix = cp['Prefix']
-                    for month_page in paginator.paginate(Bucket=self.bucket, Prefix=year_prefix, Delimiter='/'):
-                        for month_cp in month_page.get('CommonPrefixes', []):
-                            month_prefix = month_cp['Prefix']
-                            for day_page in paginator.paginate(Bucket=self.bucket, Prefix=month_prefix, Delimiter='/'):
-                                for day_cp in day_page.get('CommonPrefixes', []):
-                                    parts = day_cp['Prefix'].rstrip('/').split('/')
-                                    if len(parts) >= 4:
-                                        date_str = f"{parts[1]}-{parts[2]}-{parts[3]}"
-                                        dates.add(date_str)
-        except ClientError as e:
-            print(f"Error listing S3 data: {e}")
-            return []
-
-        return sorted(dates)
-
-    def list_files_by_date(self, date: str) -> List[Dict[str, Any]]:
-        """List all weather files for a specific date"""
-        try:
-            parsed_date = datetime.strptime(date, '%Y-%m-%d')
-            prefix = f"weather/{parsed_date.strftime('%Y/%m/%d')}/"
-        except ValueError:
-            return []
-
-        files = []
         paginator = self.s3.get_paginator('list_objects_v2')
 
         try:
-            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for page in paginator.paginate(**paginate_kwargs):
                 for obj in page.get('Contents', []):
-                    key = obj['Key']
-                    if key.endswith('.json') and 'latest' not in key:
-                        filename = key.split('/')[-1]
-                        if filename.startswith('weather_'):
-                            time_str = filename.replace('weather_', '').replace('.json', '')
-                            if len(time_str) == 4:
-                                hour = time_str[:2]
-                                minute = time_str[2:]
-                                files.append({
-                                    'key': key,
-                                    'time': f"{date}T{hour}:{minute}:00+08:00",
-                                    'size': obj['Size']
-                                })
-        except ClientError as e:
-            print(f"Error listing files for {date}: {e}")
+                    match = _FILE_KEY_RE.match(obj['Key'])
+                    if not match:
+                        continue
+
+                    year, month, day, hour, minute = match.groups()
+                    date = f"{year}-{month}-{day}"
+                    if end_date and date > end_date:
+                        return
 
-        return sorted(files, key=lambda x: x['time'])
+                    yield f"{date}T{hour}:{minute}:00+08:00", obj['Key'], obj['Size']
+        except ClientError as e:
+            print(f"Error listing weather files: {e}")
 
     def get_json(self, s3_key: str) -> Optional[Dict]:
-        """Read JSON file from S3"""
+        """
+        Read JSON file from S3.
+
+        With a cache_dir, a HEAD request resolves the ETag and cached content
+        is parsed without downloading the object again. A missing or
+        unreadable cache entry falls back to the download.
+        """
         try:
+            cache_path = None
+            if self.cache_dir:
+                head = self.s3.head_object(Bucket=self.bucket, Key=s3_key)
+                cache_path = self.cache_dir / head['ETag'].strip('"')
+                data = self._read_cache(cache_path)
+                if data is not None:
+                    return data
+
             response = self.s3.get_object(Bucket=self.bucket, Key=s3_key)
-            content = response['Body'].read().decode('utf-8')
-            return json.loads(content)
+            content = response['Body'].read()
+            data = _loads(content)
+
+            # Only cache content that parsed
+            if cache_path:
+                self._write_cache(cache_path, content)
+            return data
         except ClientError as e:
-            if e.response['Error']['Code'] == 'NoSuchKey':
+            # HEAD reports a missing key as 404 rather than NoSuchKey
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
                 return None
             print(f"Error reading {s3_key}: {e}")
             return None
@@ -185,6 +295,44 @@ class S3WeatherReader:
             print(f"JSON parse error for {s3_key}: {e}")
             return None
 
+    @staticmethod
+    def _read_cache(cache_path: Path) -> Optional[Dict]:
+        """Parse cached object content, or None if it is missing or unreadable"""
+        try:
+            content = cache_path.read_bytes()
+            os.utime(cache_path)
+            return _loads(content)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read cache {cache_path.name}: {e}")
+            return None
+
+    @staticmethod
+    def _write_cache(cache_path: Path, content: bytes) -> None:
+        """Atomically write object content to the cache"""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write cache {cache_path.name}: {e}")
+
+
+def prune_cache(cache_dir: Path, max_age_days: int) -> None:
+    """Remove cached objects not used within max_age_days"""
+    if not cache_dir.exists():
+        return
+
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).timestamp()
+    for path in cache_dir.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
 
 def load_land_mask() -> Optional[np.ndarray]:
     """
@@ -196,23 +344,21 @@ def load_land_mask() -> Optional[np.ndarray]:
         return None
 
     try:
-        with open(TEMPERATURE_FILE, 'r') as f:
-            temp_data = json.load(f)
+        temp_data = _loads(TEMPERATURE_FILE.read_bytes())
 
         # Use first frame to create mask
         first_frame = temp_data['frames'][0]['data']
-        mask = np.array([
-            [val is not None and val > -900 for val in row]
-            for row in first_frame
-        ])
-        return mask
+        # None becomes NaN, which compares False like a missing value
+        grid = np.array(first_frame, dtype=np.float64)
+        return grid > -900
     except Exception as e:
         print(f"Warning: Could not load land mask: {e}")
         return None
 
 
-# Global land mask (loaded once)
+# Global land mask and flat land point indices (loaded once)
 LAND_MASK = None
+LAND_IDX = None
 
 
 def get_land_mask() -> Optional[np.ndarray]:
@@ -223,198 +369,328 @@ def get_land_mask() -> Optional[np.ndarray]:
     return LAND_MASK
 
 
-def interpolate_humidity(stations: List[Dict], geo_info: Dict) -> Tuple[List[List], Dict]:
+def get_land_indices() -> np.ndarray:
+    """
+    Get flat indices of the land grid points.
+    Without a land mask, every grid point is treated as land.
+    """
+    global LAND_IDX
+    if LAND_IDX is None:
+        land_mask = get_land_mask()
+        if land_mask is None:
+            LAND_IDX = np.arange(len(GRID_POINTS))
+        else:
+            LAND_IDX = np.flatnonzero(land_mask.ravel())
+    return LAND_IDX
+
+
+@lru_cache(maxsize=32)
+def get_idw_weights(station_points: Tuple[Tuple[float, float], ...]) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Get inverse distance weights from a station layout to every land grid point.
+
+    Station locations rarely change between frames, so the nearest-station
+    lookup and weights are cached and each frame is a single weighted sum.
+    Ocean points are masked out anyway and get no weights.
+
+    Returns:
+        Tuple of (station indices, normalized weights), both shaped
+        (land points, IDW_NEIGHBORS)
+    """
+    land_points = GRID_POINTS[get_land_indices()]
+    dist, idx = cKDTree(np.array(station_points)).query(land_points, k=IDW_NEIGHBORS)
+
+    with np.errstate(divide='ignore'):
+        weights = 1.0 / dist ** IDW_POWER
+
+    # Grid points exactly on a station take that station's value
+    exact = dist == 0
+    on_station = exact.any(axis=1)
+    weights[on_station] = exact[on_station]
+
+    weights /= weights.sum(axis=1, keepdims=True)
+    return idx, weights
+
+
+def idw_sum(values: 'np.ndarray', idx: 'np.ndarray', weights: 'np.ndarray') -> 'np.ndarray':
+    """Weighted sum of the neighbouring station values for every grid point"""
+    return (values[idx] * weights).sum(axis=1)
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def idw_sum(values, idx, weights):  # noqa: F811
+        out = np.empty(idx.shape[0])
+        for i in prange(idx.shape[0]):
+            total = 0.0
+            for j in range(idx.shape[1]):
+                total += values[idx[i, j]] * weights[i, j]
+            out[i] = total
+        return out
+
+
+def interpolate_humidity(stations: List[Dict]) -> Tuple[List[List], Dict]:
     """
-    Interpolate station humidity data to regular grid using scipy griddata.
+    Interpolate station humidity data to the GEO_INFO grid using inverse
+    distance weighting over the nearest IDW_NEIGHBORS stations.
 
     Args:
         stations: List of station data with latitude, longitude, humidity
-        geo_info: Grid configuration
 
     Returns:
-        Tuple of (grid_data as 2D list, stats dict)
+        Tuple of (grid_data as 2D list of integer tenths, stats dict)
     """
-    # Filter stations with valid humidity data
-    valid_stations = [
-        s for s in stations
-        if s.get('humidity') is not None
-        and s.get('latitude') is not None
-        and s.get('longitude') is not None
-    ]
+    # Filter stations with valid humidity data and extract
+    # (longitude, latitude, humidity) rows in a single pass
+    station_data = np.fromiter(
+        (
+            (s['longitude'], s['latitude'], s['humidity'])
+            for s in stations
+            if s.get('humidity') is not None
+            and s.get('latitude') is not None
+            and s.get('longitude') is not None
+        ),
+        dtype=np.dtype((np.float64, 3))
+    )
 
-    if len(valid_stations) < 4:
+    if len(station_data) < IDW_NEIGHBORS:
         return None, {'error': 'Not enough valid stations'}
 
-    # Extract coordinates and values
-    points = np.array([
-        (float(s['longitude']), float(s['latitude']))
-        for s in valid_stations
-    ])
-    values = np.array([float(s['humidity']) for s in valid_stations])
+    points = station_data[:, :2]
+    values = station_data[:, 2]
 
-    # Create target grid
-    lon = np.linspace(
-        geo_info['bottom_left_lon'],
-        geo_info['top_right_lon'],
-        geo_info['grid_cols']
-    )
-    lat = np.linspace(
-        geo_info['bottom_left_lat'],
-        geo_info['top_right_lat'],
-        geo_info['grid_rows']
-    )
-    grid_lon, grid_lat = np.meshgrid(lon, lat)
-
-    # Interpolate using cubic method (fallback to linear if fails)
-    try:
-        grid_humidity = griddata(
-            points, values,
-            (grid_lon, grid_lat),
-            method='cubic'
-        )
-    except Exception:
-        grid_humidity = griddata(
-            points, values,
-            (grid_lon, grid_lat),
-            method='linear'
-        )
+    # Interpolate land points only, reusing the weights for this station layout
+    # The land mask comes from temperature data, so humidity is only shown
+    # where temperature data exists (ocean areas stay None)
+    idx, weights = get_idw_weights(tuple(map(tuple, points)))
+    land_values = idw_sum(values, idx, weights)
 
     # Clip values to valid humidity range (0-100%)
-    # Cubic interpolation can produce values outside the input range at edges
-    grid_humidity = np.clip(grid_humidity, 0, 100)
-
-    # Apply land mask from temperature data
-    # This ensures humidity is only shown where temperature data exists (land areas)
-    land_mask = get_land_mask()
-    if land_mask is not None:
-        # Set ocean areas to NaN
-        grid_humidity[~land_mask] = np.nan
-
-    # Calculate statistics (excluding NaN and clipped edge values)
-    valid_grid = grid_humidity[~np.isnan(grid_humidity)]
+    np.clip(land_values, 0, 100, out=land_values)
+
+    # Calculate statistics on the land values (excluding NaN and clipped edge values)
+    valid = ~np.isnan(land_values)
     # Exclude values that were clipped to exactly 0 or 100 (edge artifacts)
-    inner_values = valid_grid[(valid_grid > 0.1) & (valid_grid < 99.9)]
+    inner = (land_values > 0.1) & (land_values < 99.9)
+    has_inner = bool(inner.any())
+    has_valid = bool(valid.any())
 
     stats = {
-        'min': round(float(np.min(inner_values)), 1) if len(inner_values) > 0 else None,
-        'max': round(float(np.max(inner_values)), 1) if len(inner_values) > 0 else None,
-        'avg': round(float(np.mean(valid_grid)), 1) if len(valid_grid) > 0 else None,
-        'valid_points': int(np.sum(~np.isnan(grid_humidity))),
-        'station_count': len(valid_stations)
+        'min': round(float(land_values.min(where=inner, initial=np.inf)), 1) if has_inner else None,
+        'max': round(float(land_values.max(where=inner, initial=-np.inf)), 1) if has_inner else None,
+        'avg': round(float(land_values.mean(where=valid)), 1) if has_valid else None,
+        'valid_points': int(np.count_nonzero(valid)),
+        'station_count': len(station_data)
     }
 
-    # Convert to list, replacing NaN with None
-    grid_list = []
-    for row in grid_humidity:
-        row_list = []
-        for val in row:
-            if np.isnan(val):
-                row_list.append(None)
-            else:
-                row_list.append(round(float(val), 1))
-        grid_list.append(row_list)
+    # Quantize land values to integer tenths; every other cell stays None
+    grid = np.full(len(GRID_POINTS), None, dtype=object)
+    grid[get_land_indices()[valid]] = np.rint(land_values[valid] / VALUE_SCALE).astype(np.int16)
+    grid_list = grid.reshape(GEO_INFO['grid_rows'], GEO_INFO['grid_cols']).tolist()
 
     return grid_list, stats
 
 
+def load_existing_frames(path: Path) -> Dict[str, Dict]:
+    """
+    Load frames from a previous timelapse output, keyed by time.
+    Outputs made with a different interpolation method or value scale
+    are not reused.
+    """
+    if not path.exists():
+        return {}
+
+    try:
+        old = _loads(path.read_bytes())
+        if old['metadata'].get('interpolation_method') != INTERPOLATION_METHOD:
+            print("  Existing output uses another interpolation method, re-processing all frames")
+            return {}
+        if old['metadata'].get('value_scale') != VALUE_SCALE:
+            print("  Existing output uses another value scale, re-processing all frames")
+            return {}
+        return {frame['time']: frame for frame in old['frames']}
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Warning: Could not read existing output: {e}")
+        return {}
+
+
 def download_and_interpolate_humidity(
     reader: S3WeatherReader,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    max_frames: int = 720
+    max_frames: int = 720,
+    workers: int = DOWNLOAD_WORKERS,
+    existing_path: Optional[Path] = None
 ) -> List[Dict]:
-    """Download weather data and interpolate humidity"""
-    print("Listing available dates...")
-    all_dates = reader.list_dates()
-
-    if not all_dates:
-        print("No weather data found")
-        return []
+    """
+    Download weather data and interpolate humidity.
 
-    print(f"  Found {len(all_dates)} dates ({all_dates[0]} ~ {all_dates[-1]})")
+    Frames already present in `existing_path` (a previous output file) are
+    reused instead of downloaded and interpolated again.
+    """
+    print("Listing weather files...")
 
-    # Filter date range
-    if start_date:
-        all_dates = [d for d in all_dates if d >= start_date]
-    if end_date:
-        all_dates = [d for d in all_dates if d <= end_date]
+    # Collect all files in the date range with a single listing
+    all_files = [
+        {'key': key, 'time': time_str, 'size': size}
+        for time_str, key, size in reader.list_all_weather_objects(start_date, end_date)
+    ]
 
-    if not all_dates:
-        print("No data in specified date range")
+    if not all_files:
+        if start_date or end_date:
+            print("No data in specified date range")
+        else:
+            print("No weather data found")
         return []
 
-    print(f"  Processing {len(all_dates)} dates")
-
-    # Collect all files
-    all_files = []
-    for date in all_dates:
-        files = reader.list_files_by_date(date)
-        all_files.extend(files)
-
-    print(f"  Total {len(all_files)} weather files")
+    print(f"  Total {len(all_files)} weather files ({all_files[0]['time'][:10]} ~ {all_files[-1]['time'][:10]})")
 
     # Limit frames
     if len(all_files) > max_frames:
         print(f"  Limiting to latest {max_frames} frames")
         all_files = all_files[-max_frames:]
 
+    # Reuse frames from the previous output
+    existing = load_existing_frames(existing_path) if existing_path else {}
+    pending = [fi for fi in all_files if fi['time'] not in existing]
+    if existing:
+        print(f"  Reusing {len(all_files) - len(pending)} frames from {existing_path.name}")
+
     # Download and interpolate
+    # Worker threads download; each frame is interpolated here as soon as its
+    # download completes, overlapping with the GETs still in flight.
+    # Frames are not batched: frames with the same station layout already
+    # share cached weights (get_idw_weights), so each one is a single gather
+    processed = {}
+    total = len(pending)
+
+    if pending:
+        print(f"Downloading and interpolating humidity data ({total} files)...")
+
+        # boto3 clients are thread-safe, so all workers share reader.s3
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(reader.get_json, file_info['key']): file_info
+                for file_info in pending
+            }
+            for completed, future in enumerate(as_completed(futures), 1):
+                if completed % 10 == 0 or completed == 1:
+                    print(f"  Progress: {completed}/{total} ({completed / total * 100:.1f}%)")
+
+                file_info = futures[future]
+                data = future.result()
+                if data and 'data' in data:
+                    stations = data['data']
+                    grid_data, stats = interpolate_humidity(stations)
+
+                    if grid_data:
+                        processed[file_info['time']] = {
+                            'time': file_info['time'],
+                            'stats': stats,
+                            'data': grid_data
+                        }
+
+    # Merge in file order (all_files is already sorted by time)
     frames = []
-    total = len(all_files)
-
-    print(f"Downloading and interpolating humidity data ({total} files)...")
+    for file_info in all_files:
+        frame = processed.get(file_info['time']) or existing.get(file_info['time'])
+        if frame:
+            frames.append(frame)
 
-    for i, file_info in enumerate(all_files):
-        if (i + 1) % 10 == 0 or i == 0:
-            print(f"  Progress: {i + 1}/{total} ({(i + 1) / total * 100:.1f}%)")
-
-        data = reader.get_json(file_info['key'])
-        if data and 'data' in data:
-            stations = data['data']
-            grid_data, stats = interpolate_humidity(stations, GEO_INFO)
+    print(f"Processed {len(processed)} new frames")
+    print(f"Total {len(frames)} valid frames")
+    return frames
 
-            if grid_data:
-                frame = {
-                    'time': file_info['time'],
-                    'stats': stats,
-                    'data': grid_data
-                }
-                frames.append(frame)
 
-    print(f"Processed {len(frames)} valid frames")
-    return frames
+def build_metadata(frames: List[Dict]) -> Dict:
+    """Build timelapse metadata for a non-empty list of frames"""
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'start_time': frames[0]['time'],
+        'end_time': frames[-1]['time'],
+        'total_frames': len(frames),
+        'geo_info': GEO_INFO,
+        'source': 'Central Weather Administration Weather Stations',
+        'description': 'Taiwan Humidity Grid Timelapse (Interpolated)',
+        'interpolation_method': INTERPOLATION_METHOD,
+        'value_scale': VALUE_SCALE
+    }
 
 
 def generate_timelapse_json(frames: List[Dict], output_path: Path) -> Dict:
-    """Generate timelapse JSON file"""
+    """
+    Generate timelapse JSON file.
+
+    Frames are streamed to disk and removed from `frames` as they are
+    written, so only one frame is serialized at a time. Returns the
+    metadata of the written file.
+    """
     if not frames:
         return {}
 
-    timelapse_data = {
-        'metadata': {
-            'generated_at': datetime.now().isoformat(),
-            'start_time': frames[0]['time'],
-            'end_time': frames[-1]['time'],
-            'total_frames': len(frames),
-            'geo_info': GEO_INFO,
-            'source': 'Central Weather Administration Weather Stations',
-            'description': 'Taiwan Humidity Grid Timelapse (Interpolated)',
-            'interpolation_method': 'scipy.griddata cubic'
-        },
-        'frames': frames
-    }
+    metadata = build_metadata(frames)
 
     # Save JSON
     print(f"Saving timelapse data...")
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(timelapse_data, f, ensure_ascii=False)
+    with open(output_path, 'wb') as f:
+        f.write(b'{"metadata":')
+        f.write(_dumps(metadata))
+        f.write(b',"frames":[')
+        frames.reverse()
+        first = True
+        while frames:
+            # Pop so each written frame can be freed immediately
+            frame = frames.pop()
+            if not first:
+                f.write(b',')
+            first = False
+            f.write(_dumps(frame))
+        f.write(b']}')
 
     file_size_mb = output_path.stat().st_size / 1024 / 1024
     print(f"  Saved: {output_path.name} ({file_size_mb:.2f} MB)")
 
-    return timelapse_data
+    return {'metadata': metadata}
+
+
+def generate_timelapse_npz(frames: List[Dict], output_path: Path) -> Dict:
+    """
+    Generate compact binary timelapse file (.npz).
+
+    Contains `data`, a float16 array of shape (frames, rows, cols) with NaN
+    for cells without data, `times`, the frame times, and `metadata`, the
+    metadata as JSON bytes.
+    """
+    if not frames:
+        return {}
+
+    metadata = build_metadata(frames)
+    # Grids are scaled back to percent below, so no further scaling applies
+    metadata['value_scale'] = 1.0
+    grids = (np.array([frame['data'] for frame in frames], dtype=np.float32) * VALUE_SCALE).astype(np.float16)
+    times = np.array([frame['time'] for frame in frames], dtype='S25')
+
+    # Save NPZ
+    print(f"Saving timelapse data...")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'wb') as f:
+        np.savez_compressed(f, data=grids, times=times, metadata=np.array(_dumps(metadata)))
+
+    file_size_mb = output_path.stat().st_size / 1024 / 1024
+    print(f"  Saved: {output_path.name} ({file_size_mb:.2f} MB)")
+
+    return {'metadata': metadata}
+
+
+def positive_int(value: str) -> int:
+    """argparse type for integers of at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
 
 
 def main():
@@ -451,8 +727,33 @@ def main():
         default=OUTPUT_FILE,
         help=f'Output file path (default: {OUTPUT_FILE})'
     )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Re-process all frames instead of reusing the existing output'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['json', 'npz'],
+        default='json',
+        help='Output format (default: json; npz is a compact float16 array file)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=positive_int,
+        default=DOWNLOAD_WORKERS,
+        help=f'Number of concurrent S3 downloads (default: {DOWNLOAD_WORKERS})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Do not use the local S3 object cache ({CACHE_DIR})'
+    )
     args = parser.parse_args()
 
+    if args.format == 'npz' and args.output == OUTPUT_FILE:
+        args.output = OUTPUT_FILE.with_suffix('.npz')
+
     print("=" * 60)
     print("Taiwan Humidity Timelapse - Data Update")
     print("=" * 60)
@@ -518,7 +819,11 @@ def main():
 
     # Initialize S3 reader
     try:
-        reader = S3WeatherReader(s3_config)
+        reader = S3WeatherReader(
+            s3_config,
+            max_pool_connections=max(S3_MAX_POOL_CONNECTIONS, args.workers),
+            cache_dir=None if args.no_cache else CACHE_DIR
+        )
     except Exception as e:
         print(f"ERROR: Cannot connect to S3: {e}")
         sys.exit(1)
@@ -528,15 +833,23 @@ def main():
         reader,
         start_date=start_date,
         end_date=end_date,
-        max_frames=args.max_frames
+        max_frames=args.max_frames,
+        workers=args.workers,
+        existing_path=None if args.full or args.format == 'npz' else args.output
     )
 
+    if not args.no_cache:
+        prune_cache(CACHE_DIR, CACHE_MAX_AGE_DAYS)
+
     if not frames:
         print("ERROR: No humidity data available")
         sys.exit(1)
 
-    # Generate JSON
-    timelapse_data = generate_timelapse_json(frames, args.output)
+    # Generate output file
+    if args.format == 'npz':
+        timelapse_data = generate_timelapse_npz(frames, args.output)
+    else:
+        timelapse_data = generate_timelapse_json(frames, args.output)
 
     # Summary
     print()